@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Shared Playwright HTML fetching for the pricing scripts.
+
+Launches a single Chromium instance per process (lazily, on first use) and
+memoizes fetched pages, so scripts that request the same URL several times
+pay the browser cold-start and page-load cost only once.
+"""
+
+import atexit
+import functools
+import hashlib
+import os
+import time
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+
+
+CACHE_DIR = ".cache"
+CACHE_MAX_AGE = 86400  # seconds; reuse HTML for about a day of parser iteration
+
+_playwright = None
+_browser = None
+
+
+def _cache_path(url: str) -> str:
+    """Return the on-disk cache path for a URL."""
+    return os.path.join(CACHE_DIR, hashlib.sha1(url.encode()).hexdigest() + ".html")
+
+
+def _get_browser():
+    """Launch the shared Chromium instance on first use."""
+    global _playwright, _browser
+
+    if _browser is None:
+        _playwright = sync_playwright().start()
+        _browser = _playwright.chromium.launch(headless=True)
+        atexit.register(_shutdown)
+
+    return _browser
+
+
+def _shutdown():
+    """Close the shared browser and Playwright driver at process exit."""
+    global _playwright, _browser
+
+    if _browser is not None:
+        _browser.close()
+        _browser = None
+    if _playwright is not None:
+        _playwright.stop()
+        _playwright = None
+
+
+@functools.lru_cache(maxsize=8)
+def fetch_html(url: str, refresh: bool = False) -> str:
+    """
+    Fetch HTML content using Playwright with proper JavaScript rendering.
+
+    Pages are memoized per process and cached on disk for a day, so
+    repeated runs during parser development skip the slow page load.
+    Pass refresh=True to bypass the disk cache and re-fetch.
+    """
+    cache_path = _cache_path(url)
+    if not refresh and os.path.exists(cache_path):
+        if os.path.getmtime(cache_path) > time.time() - CACHE_MAX_AGE:
+            print(f"Using cached HTML from {cache_path}")
+            with open(cache_path, "r", encoding="utf-8") as f:
+                return f.read()
+
+    print(f"Fetching {url} with Playwright...")
+
+    browser = _get_browser()
+    context = browser.new_context(
+        extra_http_headers={
+            "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                          "AppleWebKit/537.36 (KHTML, like Gecko) "
+                          "Chrome/112.0.0.0 Safari/537.36"),
+            "Accept-Language": "en-US,en;q=0.9"
+        }
+    )
+    page = context.new_page()
+
+    # Images, fonts, media and styles don't affect the pricing tables;
+    # aborting them shortens page load and shrinks the memory footprint
+    page.route(
+        "**/*",
+        lambda route: route.abort()
+        if route.request.resource_type in {"image", "font", "media", "stylesheet"}
+        else route.continue_()
+    )
+
+    try:
+        # DOM content is enough; the stabilization wait below covers JS rendering
+        try:
+            page.goto(url, wait_until="domcontentloaded", timeout=60000)
+        except PlaywrightTimeoutError:
+            print(f"Warning: Timeout while loading {url}, continuing with partial content")
+
+        # Wait for content to stabilize and render
+        try:
+            page.wait_for_function(
+                """() => {
+                    // Wait for content to stabilize (React/Vue rendering)
+                    const bodyText = document.body.innerText.trim();
+                    return bodyText.length > 1000; // Ensure substantial content loaded
+                }""",
+                timeout=30000
+            )
+        except PlaywrightTimeoutError:
+            print("Warning: Content stabilization timeout, continuing anyway")
+
+        # Extra delay for any remaining JS execution
+        page.wait_for_timeout(2000)
+
+        html_content = page.content()
+    finally:
+        context.close()
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(cache_path, "w", encoding="utf-8") as f:
+        f.write(html_content)
+
+    print(f"Fetched {len(html_content)} characters")
+    return html_content
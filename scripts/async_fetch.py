@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Fetch several pages concurrently with async Playwright.
+
+All URLs share one Chromium process; each navigation runs in its own
+context, so total wall time is roughly the slowest page load instead of
+the sum of all of them. Useful when iterating on parsers against multiple
+pricing/docs pages at once.
+
+Usage:
+    python async_fetch.py URL [URL ...]
+"""
+
+import asyncio
+import sys
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+
+
+_HEADERS = {
+    "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                  "AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/112.0.0.0 Safari/537.36"),
+    "Accept-Language": "en-US,en;q=0.9"
+}
+
+
+async def _fetch_one(browser, url: str) -> str:
+    """Navigate one page in its own context and return the rendered HTML."""
+    context = await browser.new_context(extra_http_headers=_HEADERS)
+    page = await context.new_page()
+
+    # Same policy as the sync fetcher: images, fonts, media and styles
+    # don't affect the parsed tables, so abort them instead of waiting
+    async def _filter_resources(route):
+        if route.request.resource_type in {"image", "font", "media", "stylesheet"}:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await page.route("**/*", _filter_resources)
+
+    try:
+        # DOM content is enough; the stabilization wait below covers JS rendering
+        try:
+            await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+        except PlaywrightTimeoutError:
+            print(f"Warning: Timeout while loading {url}, continuing with partial content")
+
+        try:
+            await page.wait_for_function(
+                "() => document.body.innerText.trim().length > 1000",
+                timeout=30000
+            )
+        except PlaywrightTimeoutError:
+            print(f"Warning: Content stabilization timeout for {url}, continuing anyway")
+
+        return await page.content()
+    finally:
+        await context.close()
+
+
+async def fetch_many(urls: list) -> list:
+    """
+    Fetch all URLs concurrently in a single browser process.
+
+    Returns the rendered HTML documents in the same order as the input URLs.
+    """
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            return await asyncio.gather(*[_fetch_one(browser, url) for url in urls])
+        finally:
+            await browser.close()
+
+
+def main():
+    """Fetch the URLs given on the command line and report sizes."""
+    urls = sys.argv[1:]
+    if not urls:
+        print(f"Usage: python {sys.argv[0]} URL [URL ...]", file=sys.stderr)
+        sys.exit(1)
+
+    pages = asyncio.run(fetch_many(urls))
+    for url, html in zip(urls, pages):
+        print(f"{url}: {len(html)} characters")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,86 +4,121 @@ Fetch OpenAI pricing from official website and save to JSON.
 This script parses the OpenAI pricing page and extracts model prices.
 """
 
-import json
+import argparse
+import logging
+import os
 import re
 import sys
+
+import orjson
 from datetime import datetime, timezone
 from typing import Dict, Any
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from bs4 import BeautifulSoup, SoupStrainer
+
+from _playwright_fetch import fetch_html
 
 
+logger = logging.getLogger(__name__)
+
 PRICING_URL = "https://platform.openai.com/docs/pricing"
 OUTPUT_FILE = "github_pages/pricing.json"
 API_FILE = "github_pages/api.json"
-HISTORY_FILE = "github_pages/history.json"
-
-
-def fetch_html(url: str) -> str:
-    """
-    Fetch HTML content using Playwright with proper JavaScript rendering.
-    """
-    print(f"Fetching {url} with Playwright...")
-
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-
-        # Set extra HTTP headers for proper rendering
-        page.set_extra_http_headers({
-            "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                          "AppleWebKit/537.36 (KHTML, like Gecko) "
-                          "Chrome/112.0.0.0 Safari/537.36"),
-            "Accept-Language": "en-US,en;q=0.9"
-        })
-
-        # Wait for network to be idle (all resources loaded and JS executed)
-        try:
-            page.goto(url, wait_until="networkidle", timeout=60000)
-        except PlaywrightTimeoutError:
-            print(f"Warning: Timeout while loading {url}, continuing with partial content")
-
-        # Wait for content to stabilize and render
-        try:
-            page.wait_for_function(
-                """() => {
-                    // Wait for content to stabilize (React/Vue rendering)
-                    const bodyText = document.body.innerText.trim();
-                    return bodyText.length > 1000; // Ensure substantial content loaded
-                }""",
-                timeout=30000
-            )
-        except PlaywrightTimeoutError:
-            print("Warning: Content stabilization timeout, continuing anyway")
-
-        # Extra delay for any remaining JS execution
-        page.wait_for_timeout(2000)
-
-        html_content = page.content()
-        browser.close()
-
-        print(f"Fetched {len(html_content)} characters")
-        return html_content
+HISTORY_FILE = "github_pages/history.jsonl"
+LEGACY_HISTORY_FILE = "github_pages/history.json"
+HISTORY_MAX_DAYS = 90
+
+# Compiled once; parse_price runs for every cell of every pricing table
+_PRICE_RE = re.compile(r'(\d[\d,]*(?:\.\d+)?)')
+
+# Quick fingerprint for tables worth parsing: pricing keywords or the
+# quality/resolution markers of image pricing tables
+_PRICING_TABLE_RE = re.compile(r'model|input|output|price|quality|\d+\s*[x×]\s*\d+', re.I)
+
+# Ordered model-name keyword rules; first matching rule wins, mirroring the
+# priority of the old chained any(...) checks but scanned in a single pass
+_PRICING_TYPE_RULES = [
+    (('gpt', 'o1', 'o3', 'o4'), 'per_1m_tokens'),   # GPT / reasoning models
+    (('dall-e', 'dall·e'), 'per_image'),            # Image generation
+    (('sora',), 'per_second'),                      # Video
+    (('whisper',), 'per_minute'),                   # Audio transcription
+    (('tts',), 'per_1k_chars'),                     # Text-to-speech
+    (('embedding',), 'per_1m_tokens'),              # Embeddings
+]
+
+_CATEGORY_RULES = [
+    (('gpt-image',), 'image_generation_token'),
+    (('dall-e', 'dall·e'), 'image_generation'),
+    (('sora',), 'video_generation'),
+    (('whisper',), 'audio_transcription'),
+    (('tts',), 'text_to_speech'),
+    (('embedding',), 'embeddings'),
+    (('o1', 'o3', 'o4'), 'reasoning'),              # skipped for mini variants
+    (('gpt-5', 'gpt-4', 'gpt-3.5', 'davinci', 'babbage'), 'language_model'),
+    (('computer-use',), 'computer_use'),
+    (('storage',), 'storage'),
+]
+
+
+def _infer_pricing_type(model_name_lower: str):
+    """Infer pricing type from a lowercased model name, or None."""
+    for keywords, pricing_type in _PRICING_TYPE_RULES:
+        if any(k in model_name_lower for k in keywords):
+            return pricing_type
+    return None
+
+
+def _infer_category(model_name_lower: str) -> str:
+    """Infer model category from a lowercased model name."""
+    for keywords, category in _CATEGORY_RULES:
+        if any(k in model_name_lower for k in keywords):
+            # Mini reasoning variants fall through to the language-model rule
+            if category == 'reasoning' and 'mini' in model_name_lower:
+                continue
+            return category
+    return 'other'
 
 
 def parse_price(text: str) -> float:
-    """Extract price from text like '$2.50', '2.50', etc."""
+    """Extract price from text like '$2.50', '2.50', '1,234.56', etc."""
     if not text:
         return 0.0
 
-    # Remove $ and whitespace
-    cleaned = re.sub(r'[\$\s,]', '', text)
-
-    # Try to extract first number
-    match = re.search(r'(\d+\.?\d*)', cleaned)
+    # Single scan: find the number in place, strip thousands separators
+    # from the captured group only (no intermediate cleaned string)
+    match = _PRICE_RE.search(text)
     if match:
-        return float(match.group(1))
+        return float(match.group(1).replace(',', ''))
     return 0.0
 
 
+def _classify_header(header: str):
+    """Classify a table header into a (field, pricing_type) tag, or None.
+
+    Mirrors the priority of the old chained substring checks, but runs once
+    per header instead of once per cell.
+    """
+    # Language models (tokens)
+    if 'input' in header and 'cached' not in header:
+        return ('input', 'per_1m_tokens')
+    if 'output' in header:
+        return ('output', 'per_1m_tokens')
+    if 'cached input' in header:
+        return ('cached_input', None)
+    # Audio models
+    if 'minute' in header:
+        return ('price', 'per_minute')
+    # Video models
+    if 'second' in header:
+        return ('price', 'per_second')
+    # Generic price - pricing type determined later by model name
+    if 'price' in header:
+        return ('price', None)
+    return None
+
+
 def parse_image_resolution_table(table, headers: list, pricing: Dict[str, Any]) -> None:
     """Parse image resolution pricing tables (e.g., 1024x1024, quality-based)."""
-    print(f"    Parsing image resolution table...")
+    logger.debug("    Parsing image resolution table...")
 
     # Extract resolution headers (e.g., "1024 x 1024", "1024 x 1536")
     resolution_indices = {}
@@ -93,7 +128,7 @@ def parse_image_resolution_table(table, headers: list, pricing: Dict[str, Any])
             resolution = re.sub(r'\s*x\s*', 'x', header)
             resolution_indices[idx] = resolution
 
-    print(f"    Resolution columns: {resolution_indices}")
+    logger.debug("    Resolution columns: %s", resolution_indices)
 
     # Get quality column index (if exists)
     quality_idx = None
@@ -102,16 +137,19 @@ def parse_image_resolution_table(table, headers: list, pricing: Dict[str, Any])
             quality_idx = idx
             break
 
-    rows = table.find_all('tr')[1:]  # Skip header
+    rows = table.select('tr')[1:]  # Skip header
 
     current_model = None
     for row_idx, row in enumerate(rows, 1):
-        cells = row.find_all(['td', 'th'])
+        cells = row.select('td, th')
         if len(cells) < 2:
             continue
 
+        # Extract cell text once per row
+        cell_texts = [c.get_text(strip=True) for c in cells]
+
         # First cell might be model name or quality
-        first_cell = cells[0].get_text(strip=True)
+        first_cell = cell_texts[0]
 
         # Check if this is a quality label
         if first_cell.lower() in ['low', 'medium', 'high', 'standard', 'hd']:
@@ -123,14 +161,14 @@ def parse_image_resolution_table(table, headers: list, pricing: Dict[str, Any])
                 continue
             # Valid model name
             current_model = first_cell
-            print(f"    Row {row_idx}: Model = {current_model}")
+            logger.debug("    Row %d: Model = %s", row_idx, current_model)
             quality = 'standard'  # default quality for new model
         else:
             quality = 'standard'  # default
 
         # Try to find quality in dedicated column if exists
-        if quality_idx and quality_idx < len(cells):
-            quality_text = cells[quality_idx].get_text(strip=True).lower()
+        if quality_idx and quality_idx < len(cell_texts):
+            quality_text = cell_texts[quality_idx].lower()
             # Only use if it's a valid quality label
             if quality_text in ['low', 'medium', 'high', 'standard', 'hd']:
                 quality = quality_text
@@ -142,8 +180,8 @@ def parse_image_resolution_table(table, headers: list, pricing: Dict[str, Any])
         # Extract prices for each resolution
         resolution_prices = {}
         for idx, resolution in resolution_indices.items():
-            if idx < len(cells):
-                price = parse_price(cells[idx].get_text(strip=True))
+            if idx < len(cell_texts):
+                price = parse_price(cell_texts[idx])
                 if price > 0:
                     resolution_prices[resolution] = price
 
@@ -169,55 +207,67 @@ def parse_image_resolution_table(table, headers: list, pricing: Dict[str, Any])
 
         pricing[model_key]["image_pricing"][quality] = resolution_prices
 
-        print(f"      {quality}: {resolution_prices}")
+        logger.debug("      %s: %s", quality, resolution_prices)
 
 
 def parse_pricing_html(html: str) -> Dict[str, Any]:
     """Parse OpenAI pricing HTML and extract model prices."""
-    soup = BeautifulSoup(html, 'html.parser')
+    # lxml is much faster than html.parser on the ~100KB pricing page, and
+    # the strainer skips building DOM nodes for everything outside tables
+    soup = BeautifulSoup(html, 'lxml', parse_only=SoupStrainer('table'))
     pricing = {}
 
-    # Find all tables on the page
-    tables = soup.find_all('table')
-    print(f"Found {len(tables)} tables")
+    # Find all tables on the page (CSS selectors dispatch to lxml's
+    # C-level engine rather than Python-side filter callbacks)
+    tables = soup.select('table')
+    logger.debug("Found %d tables", len(tables))
 
     for table_idx, table in enumerate(tables):
-        print(f"\nProcessing table {table_idx + 1}...")
+        logger.debug("Processing table %d...", table_idx + 1)
+
+        # Cheap fingerprint on the leading table HTML: skip obvious
+        # non-pricing tables before paying for header extraction
+        if not _PRICING_TABLE_RE.search(str(table)[:2000]):
+            logger.debug("  Skipping table (no pricing keywords)")
+            continue
 
         # Get headers
-        headers = []
-        header_row = table.find('thead')
-        if header_row:
-            headers = [th.get_text(strip=True).lower() for th in header_row.find_all(['th', 'td'])]
-        else:
+        headers = [th.get_text(strip=True).lower() for th in table.select('thead th, thead td')]
+        if not headers:
             # Try first row as headers
-            first_row = table.find('tr')
+            first_row = table.select_one('tr')
             if first_row:
-                headers = [th.get_text(strip=True).lower() for th in first_row.find_all(['th', 'td'])]
+                headers = [th.get_text(strip=True).lower() for th in first_row.select('th, td')]
 
-        print(f"  Headers: {headers}")
+        logger.debug("  Headers: %s", headers)
 
         # Check if this is an image resolution pricing table
         if any('x' in h and any(char.isdigit() for char in h) for h in headers):
-            print(f"  Detected image resolution pricing table")
+            logger.debug("  Detected image resolution pricing table")
             parse_image_resolution_table(table, headers, pricing)
             continue
 
         # Skip if no relevant headers
         if not any(keyword in ' '.join(headers) for keyword in ['model', 'input', 'output', 'price']):
-            print(f"  Skipping table (no pricing headers)")
+            logger.debug("  Skipping table (no pricing headers)")
             continue
 
+        # Classify each header once; the row loop dispatches on the tags
+        header_tags = [_classify_header(h) for h in headers]
+
         # Get all rows
-        rows = table.find_all('tr')
+        rows = table.select('tr')
 
         for row_idx, row in enumerate(rows[1:], 1):  # Skip header row
-            cells = row.find_all(['td', 'th'])
+            cells = row.select('td, th')
             if len(cells) < 2:
                 continue
 
+            # Extract cell text once per row; the dispatch below only indexes
+            cell_texts = [c.get_text(strip=True) for c in cells]
+
             # First cell is usually model name
-            model_name = cells[0].get_text(strip=True)
+            model_name = cell_texts[0]
 
             # Skip invalid model names
             if not model_name or len(model_name) < 3:
@@ -227,7 +277,7 @@ def parse_pricing_html(html: str) -> Dict[str, Any]:
             if not any(c.isalnum() for c in model_name):
                 continue
 
-            print(f"  Row {row_idx}: {model_name}")
+            logger.debug("  Row %d: %s", row_idx, model_name)
 
             # Extract prices based on headers
             model_data = {
@@ -238,81 +288,32 @@ def parse_pricing_html(html: str) -> Dict[str, Any]:
             }
 
             # Try to find input/output prices (for language models)
-            for idx, header in enumerate(headers):
-                if idx >= len(cells):
+            for idx, tag in enumerate(header_tags):
+                if idx >= len(cell_texts):
                     break
+                if tag is None:
+                    continue
+
+                price = parse_price(cell_texts[idx])
+                if price <= 0:
+                    continue
 
-                cell_text = cells[idx].get_text(strip=True)
-                price = parse_price(cell_text)
-
-                # Language models (tokens)
-                if 'input' in header and 'cached' not in header and price > 0:
-                    model_data['input'] = price
-                    model_data['pricing_type'] = 'per_1m_tokens'
-                elif 'output' in header and price > 0:
-                    model_data['output'] = price
-                    model_data['pricing_type'] = 'per_1m_tokens'
-                elif 'cached input' in header and price > 0:
-                    model_data['cached_input'] = price
-                # Audio models
-                elif 'minute' in header and price > 0:
-                    model_data['price'] = price
-                    model_data['pricing_type'] = 'per_minute'
-                # Video models
-                elif 'second' in header and price > 0:
-                    model_data['price'] = price
-                    model_data['pricing_type'] = 'per_second'
-                # Generic price - determine by model name
-                elif 'price' in header and price > 0:
-                    model_data['price'] = price
+                field, pricing_type = tag
+                model_data[field] = price
+                if pricing_type:
+                    model_data['pricing_type'] = pricing_type
 
             # Determine pricing type and category from model name if not already set
             model_name_lower = model_name.lower()
 
             # Determine pricing type if still unknown
             if model_data['pricing_type'] == 'unknown' and 'price' in model_data:
-                # GPT models (language)
-                if any(x in model_name_lower for x in ['gpt', 'o1', 'o3', 'o4']):
-                    model_data['pricing_type'] = 'per_1m_tokens'
-                # Image generation models
-                elif any(x in model_name_lower for x in ['dall-e', 'dall·e']):
-                    model_data['pricing_type'] = 'per_image'
-                # Video models
-                elif 'sora' in model_name_lower:
-                    model_data['pricing_type'] = 'per_second'
-                # Audio transcription
-                elif 'whisper' in model_name_lower:
-                    model_data['pricing_type'] = 'per_minute'
-                # Text-to-speech
-                elif 'tts' in model_name_lower:
-                    model_data['pricing_type'] = 'per_1k_chars'
-                # Embeddings
-                elif 'embedding' in model_name_lower:
-                    model_data['pricing_type'] = 'per_1m_tokens'
+                inferred_type = _infer_pricing_type(model_name_lower)
+                if inferred_type:
+                    model_data['pricing_type'] = inferred_type
 
             # Determine category based on model characteristics
-            if 'gpt-image' in model_name_lower:
-                model_data['category'] = 'image_generation_token'
-            elif any(x in model_name_lower for x in ['dall-e', 'dall·e']):
-                model_data['category'] = 'image_generation'
-            elif 'sora' in model_name_lower:
-                model_data['category'] = 'video_generation'
-            elif 'whisper' in model_name_lower:
-                model_data['category'] = 'audio_transcription'
-            elif 'tts' in model_name_lower:
-                model_data['category'] = 'text_to_speech'
-            elif 'embedding' in model_name_lower:
-                model_data['category'] = 'embeddings'
-            elif any(x in model_name_lower for x in ['o1', 'o3', 'o4']) and 'mini' not in model_name_lower:
-                model_data['category'] = 'reasoning'
-            elif any(x in model_name_lower for x in ['gpt-5', 'gpt-4', 'gpt-3.5', 'davinci', 'babbage']):
-                model_data['category'] = 'language_model'
-            elif 'computer-use' in model_name_lower:
-                model_data['category'] = 'computer_use'
-            elif 'storage' in model_name_lower:
-                model_data['category'] = 'storage'
-            else:
-                model_data['category'] = 'other'
+            model_data['category'] = _infer_category(model_name_lower)
 
             # Only add if has meaningful pricing data
             has_pricing = any(k in model_data for k in ['input', 'output', 'price', 'cached_input'])
@@ -331,7 +332,7 @@ def parse_pricing_html(html: str) -> Dict[str, Any]:
                 else:
                     pricing[model_key] = model_data
 
-                print(f"    Extracted: {model_data}")
+                logger.debug("    Extracted: %s", model_data)
 
     return pricing
 
@@ -349,54 +350,134 @@ def create_api_json(pricing: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def update_history(pricing: Dict[str, Any]) -> None:
-    """Update pricing history JSON file."""
-    history = []
-    
-    # Load existing history
+def _read_last_history_line(f) -> tuple:
+    """Return (start offset, contents) of the last non-empty line of a binary file."""
+    f.seek(0, os.SEEK_END)
+    end = f.tell()
+
+    # Skip trailing newlines
+    while end > 0:
+        f.seek(end - 1)
+        if f.read(1) != b'\n':
+            break
+        end -= 1
+    if end == 0:
+        return 0, b''
+
+    # Scan backwards in blocks until the previous newline is found
+    start = end
+    while start > 0:
+        read_from = max(0, start - 65536)
+        f.seek(read_from)
+        buf = f.read(start - read_from)
+        newline = buf.rfind(b'\n')
+        if newline != -1:
+            start = read_from + newline + 1
+            break
+        start = read_from
+
+    f.seek(start)
+    return start, f.read(end - start)
+
+
+def _migrate_legacy_history() -> None:
+    """One-time conversion of the old history.json array to JSON Lines."""
+    if os.path.exists(HISTORY_FILE) or not os.path.exists(LEGACY_HISTORY_FILE):
+        return
+
+    with open(LEGACY_HISTORY_FILE, 'rb') as f:
+        history = orjson.loads(f.read())
+
+    history = sorted(history, key=lambda x: x['date'])
+    with open(HISTORY_FILE, 'wb') as f:
+        for entry in history:
+            f.write(orjson.dumps(entry) + b'\n')
+
+    print(f"Migrated {len(history)} history entries to {HISTORY_FILE}")
+
+
+def compact_history(max_days: int = HISTORY_MAX_DAYS) -> None:
+    """Trim the history file to the most recent max_days entries."""
     try:
-        with open(HISTORY_FILE, 'r', encoding='utf-8') as f:
-            history = json.load(f)
+        with open(HISTORY_FILE, 'rb') as f:
+            entries = [orjson.loads(line) for line in f if line.strip()]
     except FileNotFoundError:
-        pass
-    
+        return
+
+    entries = sorted(entries, key=lambda x: x['date'])[-max_days:]
+
+    with open(HISTORY_FILE, 'wb') as f:
+        for entry in entries:
+            f.write(orjson.dumps(entry) + b'\n')
+
+    print(f"History compacted: {len(entries)} days")
+
+
+def update_history(pricing: Dict[str, Any]) -> None:
+    """Append today's entry to the pricing history (JSON Lines, one day per line)."""
+    _migrate_legacy_history()
+
     # Create today's entry
     today = datetime.now(timezone.utc).date().isoformat()
     timestamp = datetime.now(timezone.utc).isoformat()
-    
+
     today_entry = {
         "date": today,
         "timestamp": timestamp,
         "models": pricing,
         "models_count": len(pricing),
     }
-    
-    # Update or append
-    updated = False
-    for i, entry in enumerate(history):
-        if entry.get('date') == today:
-            history[i] = today_entry
-            updated = True
-            break
-    
-    if not updated:
-        history.append(today_entry)
-    
-    # Keep only last 90 days
-    history = sorted(history, key=lambda x: x['date'], reverse=True)[:90]
-    
-    # Save
-    with open(HISTORY_FILE, 'w', encoding='utf-8') as f:
-        json.dump(history, f, indent=2, ensure_ascii=False)
-    
-    print(f"\nHistory updated: {len(history)} days")
+    line = orjson.dumps(today_entry) + b'\n'
+
+    # O(1) append; only re-runs on the same day rewrite the last line
+    if os.path.exists(HISTORY_FILE):
+        with open(HISTORY_FILE, 'r+b') as f:
+            start, last_line = _read_last_history_line(f)
+            if last_line:
+                try:
+                    last_date = orjson.loads(last_line).get('date')
+                except orjson.JSONDecodeError:
+                    last_date = None
+                if last_date == today:
+                    f.truncate(start)
+            f.seek(0, os.SEEK_END)
+            f.write(line)
+    else:
+        with open(HISTORY_FILE, 'wb') as f:
+            f.write(line)
+
+    # Full rewrite is only needed to trim old days; do it weekly, not per fetch
+    if datetime.now(timezone.utc).weekday() == 6:
+        compact_history()
+
+    print(f"\nHistory updated: {HISTORY_FILE}")
 
 
 def main():
     """Main function."""
+    parser = argparse.ArgumentParser(description="Fetch OpenAI pricing and save to JSON")
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Bypass the local HTML cache and re-fetch the pricing page"
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Log per-table/per-row parsing details"
+    )
+    args = parser.parse_args()
+
+    # Per-row diagnostics are debug-level; unless enabled, the lazy %-style
+    # logging calls skip formatting entirely
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format="%(message)s"
+    )
+
     try:
         # Fetch HTML
-        html = fetch_html(PRICING_URL)
+        html = fetch_html(PRICING_URL, refresh=args.refresh)
         
         # Parse pricing
         pricing = parse_pricing_html(html)
@@ -408,14 +489,14 @@ def main():
         print(f"\n\nExtracted {len(pricing)} models")
         
         # Save full pricing data
-        with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-            json.dump(pricing, f, indent=2, ensure_ascii=False)
+        with open(OUTPUT_FILE, 'wb') as f:
+            f.write(orjson.dumps(pricing, option=orjson.OPT_INDENT_2))
         print(f"Saved to {OUTPUT_FILE}")
-        
+
         # Save API JSON
         api_data = create_api_json(pricing)
-        with open(API_FILE, 'w', encoding='utf-8') as f:
-            json.dump(api_data, f, indent=2, ensure_ascii=False)
+        with open(API_FILE, 'wb') as f:
+            f.write(orjson.dumps(api_data, option=orjson.OPT_INDENT_2))
         print(f"Saved to {API_FILE}")
         
         # Update history
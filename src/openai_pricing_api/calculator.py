@@ -4,13 +4,18 @@ Simple and clean API for calculating costs across different model types.
 """
 
 import logging
-from typing import Optional, Any
+from typing import Optional, Any, Sequence
 from pathlib import Path
 from datetime import timedelta
 
 from .pricing import PricingProvider
 from .models import CostEstimate, ActualCost, ModelPricing
 
+try:
+    import numpy as np
+except ImportError:  # optional, only needed for batch calculation
+    np = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
 
@@ -52,6 +57,10 @@ class PricingCalculator:
 
         self.provider = PricingProvider(**kwargs)  # type: ignore[arg-type]
 
+        # NumPy views of the provider's token-rate table, built on first
+        # batch call and rebuilt when the table changes
+        self._rate_arrays: Optional[tuple] = None
+
     # =========================================================================
     # Core calculation methods
     # =========================================================================
@@ -103,6 +112,82 @@ class PricingCalculator:
 
         return input_cost + output_cost + cached_cost
 
+    def calculate_token_cost_batch(
+        self,
+        models: Sequence[str],
+        input_tokens: Sequence[int],
+        output_tokens: Sequence[int],
+        cached_tokens: Optional[Sequence[int]] = None,
+    ) -> "np.ndarray":
+        """Calculate costs for many token-based calls in one vectorized step.
+
+        Applies the per-model rates with NumPy array arithmetic instead of
+        per-record Python loops, which is much faster for large
+        model x quantity sweeps. Requires numpy (pip install
+        "openai-pricing-api[batch]").
+
+        Args:
+            models: Model identifier per record
+            input_tokens: Input token count per record
+            output_tokens: Output token count per record
+            cached_tokens: Optional cached input token count per record
+
+        Returns:
+            Array of per-record costs in USD, in input order
+
+        Raises:
+            ImportError: If numpy is not installed
+            ValueError: If token counts are negative or a model is not
+                found or not token-based
+
+        Example:
+            >>> costs = calculator.calculate_token_cost_batch(
+            ...     ["gpt-4o", "gpt-5-nano"], [1000, 1000], [500, 500]
+            ... )
+            >>> print(f"Total: ${costs.sum():.4f}")
+        """
+        if np is None:
+            raise ImportError(
+                "numpy is required for batch calculation: "
+                'pip install "openai-pricing-api[batch]"'
+            )
+
+        table = self.provider.get_token_rate_table()
+        if self._rate_arrays is None or self._rate_arrays[0] is not table:
+            _, input_rates, output_rates, cached_rates = table
+            self._rate_arrays = (
+                table,
+                np.asarray(input_rates, dtype=np.float64),
+                np.asarray(output_rates, dtype=np.float64),
+                np.asarray(cached_rates, dtype=np.float64),
+            )
+        index_map = table[0]
+        _, input_rate, output_rate, cached_rate = self._rate_arrays
+
+        try:
+            idx = np.fromiter(
+                (index_map[m] if m in index_map else index_map[m.lower()] for m in models),
+                dtype=np.intp,
+                count=len(models),
+            )
+        except KeyError as e:
+            raise ValueError(f"Model not found or not token-based: {e.args[0]}") from None
+
+        in_tok = np.asarray(input_tokens, dtype=np.float64)
+        out_tok = np.asarray(output_tokens, dtype=np.float64)
+        cached = (
+            np.asarray(cached_tokens, dtype=np.float64)
+            if cached_tokens is not None
+            else np.float64(0.0)
+        )
+
+        if (in_tok < 0).any() or (out_tok < 0).any() or (cached < 0).any():
+            raise ValueError("Token counts must be >= 0")
+
+        return (
+            in_tok * input_rate[idx] + out_tok * output_rate[idx] + cached * cached_rate[idx]
+        ) / 1_000_000
+
     def calculate_image_cost(
         self,
         model: str,
@@ -223,43 +308,54 @@ class PricingCalculator:
                 logger.warning(f"No model specified for stage: {stage_name}")
                 continue
 
-            try:
-                # Get pricing to determine type
-                pricing = self.provider.get_model_pricing(model)
-                if not pricing:
-                    logger.warning(f"No pricing found for model: {model}")
-                    continue
+            # Get pricing to determine type
+            pricing = self.provider.get_model_pricing(model)
+            if not pricing:
+                logger.warning(f"No pricing found for model: {model}")
+                continue
 
-                # Calculate based on type
-                if pricing.pricing_type == "per_1m_tokens":
-                    cost = self.calculate_token_cost(
-                        model,
-                        input_tokens=stage_usage.get("input_tokens", 0),
-                        output_tokens=stage_usage.get("output_tokens", 0),
-                        cached_tokens=stage_usage.get("cached_tokens", 0),
-                    )
-                elif pricing.pricing_type == "per_image_resolution":
-                    cost = self.calculate_image_cost(
-                        model,
-                        count=stage_usage.get("count", 1),
-                        size=stage_usage.get("size", "1024x1024"),
-                        quality=stage_usage.get("quality", "standard"),
-                    )
-                elif pricing.pricing_type == "per_second":
-                    cost = self.calculate_video_cost(
-                        model,
-                        duration_seconds=stage_usage.get("duration_seconds", 0.0),
-                    )
-                else:
-                    logger.warning(f"Unknown pricing type for {model}: {pricing.pricing_type}")
+            # Precheck stage inputs explicitly instead of catching the
+            # ValueError the calculate_* methods would raise — no exception
+            # unwind cost on the per-stage hot path
+            if pricing.pricing_type == "per_1m_tokens":
+                input_tokens = stage_usage.get("input_tokens", 0)
+                output_tokens = stage_usage.get("output_tokens", 0)
+                cached_tokens = stage_usage.get("cached_tokens", 0)
+                if input_tokens < 0 or output_tokens < 0 or cached_tokens < 0:
+                    logger.error(f"Negative token counts for {stage_name} ({model}), skipping")
                     continue
-
-                total_cost += cost
-
-            except Exception as e:
-                logger.error(f"Failed to calculate cost for {stage_name} ({model}): {e}")
+                cost = self.calculate_token_cost(
+                    model,
+                    input_tokens=input_tokens,
+                    output_tokens=output_tokens,
+                    cached_tokens=cached_tokens,
+                )
+            elif pricing.pricing_type == "per_image_resolution":
+                count = stage_usage.get("count", 1)
+                if count < 1:
+                    logger.error(f"Invalid image count for {stage_name} ({model}), skipping")
+                    continue
+                if not pricing.image_pricing:
+                    logger.error(f"No image pricing data for {stage_name} ({model}), skipping")
+                    continue
+                cost = self.calculate_image_cost(
+                    model,
+                    count=count,
+                    size=stage_usage.get("size", "1024x1024"),
+                    quality=stage_usage.get("quality", "standard"),
+                )
+            elif pricing.pricing_type == "per_second":
+                duration_seconds = stage_usage.get("duration_seconds", 0.0)
+                if duration_seconds < 0:
+                    logger.error(f"Negative duration for {stage_name} ({model}), skipping")
+                    continue
+                cost = self.calculate_video_cost(model, duration_seconds=duration_seconds)
+            else:
+                logger.warning(f"Unknown pricing type for {model}: {pricing.pricing_type}")
                 continue
 
+            total_cost += cost
+
         return total_cost
 
     # =========================================================================
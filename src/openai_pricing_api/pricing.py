@@ -5,6 +5,7 @@ Fetches model pricing from external API and caches locally.
 
 import json
 import logging
+import urllib.error
 import urllib.request
 from pathlib import Path
 from typing import Optional
@@ -12,8 +13,27 @@ from datetime import datetime, timedelta
 
 from .models import ModelPricing
 
+try:
+    import orjson
+except ImportError:  # optional speedup, stdlib json is the fallback
+    orjson = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
+
+def _json_loads(raw: bytes) -> dict:
+    """Parse JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+def _json_dumps(obj: dict) -> bytes:
+    """Serialize to indented JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
 # Default configuration
 DEFAULT_API_URL = "https://bes-dev.github.io/openai-pricing-api/api.json"
 DEFAULT_CACHE_DURATION = timedelta(hours=12)
@@ -55,10 +75,24 @@ class PricingProvider:
         # In-memory cache
         self._pricing_data: Optional[dict[str, dict]] = None
         self._cache_timestamp: Optional[datetime] = None
+        self._etag: Optional[str] = None
+
+        # Case-folded lookup index, memoized ModelPricing objects and
+        # token-rate columns (all rebuilt when pricing data changes)
+        self._lower_index: dict[str, dict] = {}
+        self._indexed_data: Optional[dict[str, dict]] = None
+        self._model_cache: dict[str, Optional[ModelPricing]] = {}
+        self._rate_table: Optional[tuple[dict[str, int], list[float], list[float], list[float]]] = (
+            None
+        )
 
     def get_model_pricing(self, model: str) -> Optional[ModelPricing]:
         """Get pricing for a specific model.
 
+        Lookup is case-insensitive: an exact match is tried first,
+        then a case-folded match via a precomputed index. Results
+        (including misses) are memoized until the pricing data changes.
+
         Args:
             model: Model identifier
 
@@ -66,26 +100,36 @@ class PricingProvider:
             ModelPricing object or None if not found
         """
         data = self._load_pricing()
+        index = self._ensure_index(data)
+
+        if model in self._model_cache:
+            return self._model_cache[model]
+
         model_data = data.get(model)
+        if model_data is None:
+            # O(1) case-insensitive fallback instead of scanning all keys
+            model_data = index.get(model.lower())
 
+        pricing: Optional[ModelPricing] = None
         if not model_data:
             logger.warning(f"No pricing found for model: {model}")
-            return None
+        else:
+            try:
+                pricing = ModelPricing(
+                    model=model,
+                    pricing_type=model_data.get("pricing_type", "per_1m_tokens"),
+                    input_price=model_data.get("input"),
+                    output_price=model_data.get("output"),
+                    cached_input_price=model_data.get("cached_input"),
+                    image_pricing=model_data.get("image_pricing"),
+                    video_price_per_second=model_data.get("price"),
+                    source=model_data.get("source", "api"),
+                )
+            except Exception as e:
+                logger.error(f"Failed to parse pricing for {model}: {e}")
 
-        try:
-            return ModelPricing(
-                model=model,
-                pricing_type=model_data.get("pricing_type", "per_1m_tokens"),
-                input_price=model_data.get("input"),
-                output_price=model_data.get("output"),
-                cached_input_price=model_data.get("cached_input"),
-                image_pricing=model_data.get("image_pricing"),
-                video_price_per_second=model_data.get("price"),
-                source=model_data.get("source", "api"),
-            )
-        except Exception as e:
-            logger.error(f"Failed to parse pricing for {model}: {e}")
-            return None
+        self._model_cache[model] = pricing
+        return pricing
 
     def get_all_models(self) -> list[str]:
         """Get list of all available models.
@@ -96,6 +140,39 @@ class PricingProvider:
         data = self._load_pricing()
         return list(data.keys())
 
+    def get_token_rate_table(self) -> tuple[dict[str, int], list[float], list[float], list[float]]:
+        """Get an index map and rate columns for all token-based models.
+
+        Used for vectorized batch cost calculation. The columns share row
+        order, and the index map also contains lowercase aliases.
+
+        Returns:
+            Tuple of (model index map, input rates, output rates,
+            cached input rates), rebuilt when pricing data changes
+        """
+        data = self._load_pricing()
+        self._ensure_index(data)
+
+        if self._rate_table is None:
+            index_map: dict[str, int] = {}
+            input_rates: list[float] = []
+            output_rates: list[float] = []
+            cached_rates: list[float] = []
+
+            for name, model_data in data.items():
+                if model_data.get("pricing_type", "per_1m_tokens") != "per_1m_tokens":
+                    continue
+                row = len(input_rates)
+                index_map[name] = row
+                index_map.setdefault(name.lower(), row)
+                input_rates.append(model_data.get("input") or 0.0)
+                output_rates.append(model_data.get("output") or 0.0)
+                cached_rates.append(model_data.get("cached_input") or 0.0)
+
+            self._rate_table = (index_map, input_rates, output_rates, cached_rates)
+
+        return self._rate_table
+
     def refresh(self) -> bool:
         """Force refresh pricing data from API.
 
@@ -120,6 +197,7 @@ class PricingProvider:
             return self._pricing_data
 
         # Try to load from file cache
+        expired_models: Optional[dict[str, dict]] = None
         if self.cache_file.exists():
             try:
                 cache_data = self._load_from_cache()
@@ -128,16 +206,24 @@ class PricingProvider:
                 if cache_age < self.cache_duration:
                     self._pricing_data = cache_data["models"]
                     self._cache_timestamp = cache_data["timestamp"]
+                    self._etag = cache_data.get("etag")
                     logger.debug(f"Loaded {len(self._pricing_data)} models from cache")
                     return self._pricing_data
                 else:
                     logger.debug(f"Cache expired (age: {cache_age})")
+                    # Keep expired data around for revalidation / offline fallback
+                    expired_models = cache_data["models"]
+                    self._etag = cache_data.get("etag")
             except Exception as e:
                 logger.warning(f"Failed to load cache: {e}")
 
-        # Fetch from API
+        # Fetch from API (revalidating the expired cache when possible)
         try:
-            data = self._fetch_from_api()
+            data = self._fetch_from_api(etag=self._etag if expired_models else None)
+            if data is None:
+                # 304 Not Modified: the expired cache is still current
+                logger.debug("Pricing unchanged on server, reusing cached data")
+                data = expired_models or {}
             self._save_to_cache(data)
             self._pricing_data = data
             self._cache_timestamp = datetime.now()
@@ -147,30 +233,41 @@ class PricingProvider:
             logger.error(f"Failed to fetch from API: {e}")
 
             # Fallback to expired cache if available
-            if self.cache_file.exists():
-                try:
-                    cache_data = self._load_from_cache()
-                    logger.warning("Using expired cache as fallback")
-                    self._pricing_data = cache_data["models"]
-                    return self._pricing_data
-                except Exception as e:
-                    logger.error(f"Failed to load fallback cache: {e}")
+            if expired_models is not None:
+                logger.warning("Using expired cache as fallback")
+                self._pricing_data = expired_models
+                return self._pricing_data
 
             # Return empty dict as last resort
             logger.error("No pricing data available")
             return {}
 
-    def _fetch_from_api(self) -> dict[str, dict]:
-        """Fetch pricing data from API."""
+    def _fetch_from_api(self, etag: Optional[str] = None) -> Optional[dict[str, dict]]:
+        """Fetch pricing data from API.
+
+        Sends a conditional request when an ETag from a previous fetch is
+        available; returns None on 304 Not Modified so the caller can keep
+        its cached copy without re-downloading the full payload.
+        """
         logger.debug(f"Fetching pricing from {self.api_url}")
-        with urllib.request.urlopen(self.api_url, timeout=10) as response:
-            data = json.loads(response.read().decode("utf-8"))
+        request = urllib.request.Request(self.api_url)
+        if etag:
+            request.add_header("If-None-Match", etag)
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                self._etag = response.headers.get("ETag")
+                data = _json_loads(response.read())
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                self._etag = e.headers.get("ETag") or etag
+                return None
+            raise
         return data.get("models", {})
 
     def _load_from_cache(self) -> dict:
         """Load data from cache file."""
-        with open(self.cache_file, "r") as f:
-            data = json.load(f)
+        with open(self.cache_file, "rb") as f:
+            data = _json_loads(f.read())
 
         # Parse timestamp
         timestamp_str = data.get("timestamp")
@@ -186,17 +283,27 @@ class PricingProvider:
         cache_data = {
             "timestamp": datetime.now().isoformat(),
             "source": self.api_url,
+            "etag": self._etag,
             "models": models,
         }
 
         try:
             self.cache_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.cache_file, "w") as f:
-                json.dump(cache_data, f, indent=2)
+            with open(self.cache_file, "wb") as f:
+                f.write(_json_dumps(cache_data))
             logger.debug(f"Saved {len(models)} models to cache")
         except Exception as e:
             logger.warning(f"Failed to save cache: {e}")
 
+    def _ensure_index(self, data: dict[str, dict]) -> dict[str, dict]:
+        """Return the lowercase-keyed lookup index, rebuilding it if pricing changed."""
+        if self._indexed_data is not data:
+            self._lower_index = {key.lower(): value for key, value in data.items()}
+            self._model_cache = {}
+            self._rate_table = None
+            self._indexed_data = data
+        return self._lower_index
+
     def _is_cache_valid(self) -> bool:
         """Check if in-memory cache is still valid."""
         if not self._cache_timestamp:
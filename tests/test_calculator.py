@@ -35,6 +35,34 @@ def test_calculate_token_cost():
     assert isinstance(cost, float)
 
 
+def test_calculate_token_cost_batch():
+    """Test that batch calculation matches per-call results."""
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return  # Skip if numpy not installed
+
+    calculator = PricingCalculator()
+
+    models = [
+        m
+        for m in calculator.get_available_models()
+        if (pricing := calculator.get_model_pricing(m)) and pricing.pricing_type == "per_1m_tokens"
+    ][:5]
+    if not models:
+        return  # Skip if no token-based models available
+
+    input_tokens = [1000] * len(models)
+    output_tokens = [500] * len(models)
+
+    costs = calculator.calculate_token_cost_batch(models, input_tokens, output_tokens)
+
+    assert len(costs) == len(models)
+    for model, cost in zip(models, costs):
+        expected = calculator.calculate_token_cost(model, input_tokens=1000, output_tokens=500)
+        assert abs(cost - expected) < 1e-12
+
+
 def test_invalid_model():
     """Test that invalid model raises ValueError."""
     calculator = PricingCalculator()